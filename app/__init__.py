@@ -1,14 +1,52 @@
+import importlib
+import os
+
 from flask import Flask
 from app.db import db
-from app.routes import bp as main_bp
 
-def create_app():
+# Route group -> module with its Blueprint (`bp`). Only enabled groups are
+# imported, so a worker serving just the planner JSON never loads the rest.
+ROUTE_GROUPS = {
+    "pages": "app.routes",
+    "planner": "app.routes_planner",
+    "plans": "app.routes_plans",
+    "analytics": "app.routes_analytics",
+}
+
+# Heavy SDKs (openai, requests, bs4) are imported lazily on first use.
+# PLANNER_PRELOAD=1 imports them up front instead, e.g. with `gunicorn --preload`
+# so forked workers share the already-imported modules.
+HEAVY_MODULES = ("openai", "requests", "bs4")
+
+
+def create_app(route_groups=None):
+    """
+    route_groups: which groups from ROUTE_GROUPS to serve.
+    Defaults to $PLANNER_ROUTE_GROUPS (comma separated), or all of them.
+    """
     app = Flask(__name__)
 
     app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///planner.db"
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 
     db.init_app(app)
-    app.register_blueprint(main_bp)
 
-    return app
\ No newline at end of file
+    # new tables / columns on an existing planner.db (cheap when already current)
+    from app.init_db import upgrade_db
+    with app.app_context():
+        upgrade_db()
+
+    if route_groups is None:
+        env_groups = os.getenv("PLANNER_ROUTE_GROUPS", "")
+        route_groups = [g.strip() for g in env_groups.split(",") if g.strip()] or list(ROUTE_GROUPS)
+
+    for name in route_groups:
+        if name not in ROUTE_GROUPS:
+            raise ValueError(f"Unknown route group '{name}' (expected one of {', '.join(ROUTE_GROUPS)})")
+        app.register_blueprint(importlib.import_module(ROUTE_GROUPS[name]).bp)
+
+    if os.getenv("PLANNER_PRELOAD") == "1":
+        for mod in HEAVY_MODULES:
+            importlib.import_module(mod)
+
+    return app
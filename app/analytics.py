@@ -0,0 +1,294 @@
+"""
+analytics.py
+Degree progress aggregates over all saved plans.
+
+Each plan's contribution (which required courses it has completed / unlocked /
+blocked, and which prereqs it is missing) is kept in PlanProgress. Saving a
+plan subtracts its old contribution and adds the new one to DegreeCourseStat,
+so dashboard reads are a plain table scan no matter how many plans exist.
+"""
+
+import json
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Set, Tuple
+
+from app.db import db
+from app.models import CourseCache, CourseChange, DegreeCourseStat, Plan, PlanProgress
+from app.planner import (
+    locked_courses_with_reasons,
+    missing_prereqs,
+    normalize_code,
+    prereqs_satisfied,
+    unlocked_courses,
+)
+
+DEGREE_DIR = Path(__file__).resolve().parent / "degree"
+DEFAULT_DEGREE = "bsc_cs"
+
+STAT_FIELDS = {
+    "completed": "completed_count",
+    "unlocked": "unlocked_count",
+    "blocked": "blocked_count",
+    "missing": "missing_count",
+}
+
+REBUILD_BATCH_SIZE = 1000
+
+
+def degree_exists(degree: str) -> bool:
+    return bool(degree) and "/" not in degree and "\\" not in degree and (DEGREE_DIR / f"{degree}.json").exists()
+
+
+def load_required_courses(degree: str) -> List[str]:
+    data = json.loads((DEGREE_DIR / f"{degree}.json").read_text(encoding="utf-8"))
+    return [normalize_code(c) for c in data.get("required_courses", [])]
+
+
+def cached_course_map(required_codes: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Like services.build_degree_course_map, but DB-only (never scrapes),
+    so saving a plan can't block on the network. Uncached courses have no prereqs.
+    """
+    rows = (
+        CourseCache.query.with_entities(CourseCache.code, CourseCache.prereqs_json)
+        .filter(CourseCache.code.in_(required_codes))
+        .all()
+    )
+    prereqs = {code: json.loads(prereqs_json or "[]") for code, prereqs_json in rows}
+    return {code: {"prereqs": prereqs.get(code, [])} for code in required_codes}
+
+
+def plan_contribution(course_map: Dict[str, Dict[str, Any]], completed: Set[str]) -> Dict[str, List[str]]:
+    completed_norm = {normalize_code(c) for c in completed}
+    locked = locked_courses_with_reasons(course_map, completed_norm)
+
+    return {
+        "completed": sorted(completed_norm),
+        "unlocked": unlocked_courses(course_map, completed_norm),
+        "blocked": [item["course"] for item in locked],
+        "missing": sorted({c for item in locked for c in item["missing"]}),
+        # per blocked course, so a single course can be re-evaluated later
+        "missing_by": {item["course"]: item["missing"] for item in locked},
+    }
+
+
+def retarget_contribution(
+    contrib: Dict[str, Any],
+    completed: Set[str],
+    changed: Dict[str, List[List[str]]],
+) -> Dict[str, Any] | None:
+    """
+    Re-evaluates only the courses in changed (code -> new prereq groups) inside an
+    existing contribution. None if the contribution predates "missing_by".
+    """
+    if "missing_by" not in contrib:
+        return None
+
+    unlocked = set(contrib["unlocked"])
+    blocked = set(contrib["blocked"])
+    missing_by = dict(contrib["missing_by"])
+
+    for code, groups in changed.items():
+        if code in completed:
+            continue
+        unlocked.discard(code)
+        blocked.discard(code)
+        missing_by.pop(code, None)
+        if prereqs_satisfied(groups, completed):
+            unlocked.add(code)
+        else:
+            blocked.add(code)
+            missing_by[code] = missing_prereqs(groups, completed)
+
+    return {
+        "completed": contrib["completed"],
+        "unlocked": sorted(unlocked),
+        "blocked": sorted(blocked),
+        "missing": sorted({c for missing in missing_by.values() for c in missing}),
+        "missing_by": missing_by,
+    }
+
+
+def _add_contribution(delta: Counter, degree: str, contrib: Dict[str, Any], sign: int) -> None:
+    for field in STAT_FIELDS:
+        for code in contrib.get(field, []):
+            delta[(degree, code, field)] += sign
+
+
+def _apply_delta(delta: Counter) -> None:
+    by_degree: Dict[str, Set[str]] = {}
+    for (degree, code, _field), n in delta.items():
+        if n:
+            by_degree.setdefault(degree, set()).add(code)
+
+    now = datetime.utcnow()
+    for degree, codes in by_degree.items():
+        rows = {
+            r.code: r
+            for r in DegreeCourseStat.query.filter(
+                DegreeCourseStat.degree == degree, DegreeCourseStat.code.in_(codes)
+            )
+        }
+        for code in codes:
+            row = rows.get(code)
+            if row is None:
+                row = DegreeCourseStat(
+                    degree=degree, code=code,
+                    completed_count=0, unlocked_count=0, blocked_count=0, missing_count=0,
+                )
+                db.session.add(row)
+            for field, column in STAT_FIELDS.items():
+                n = delta.get((degree, code, field), 0)
+                if n:
+                    setattr(row, column, getattr(row, column) + n)
+            row.updated_at = now
+
+
+def update_plan_progress(
+    plans: List[Tuple[int, str, List[str]]],
+    changed: Dict[str, List[List[str]]] | None = None,
+) -> None:
+    """
+    Re-counts plans given as (plan_id, degree, completed codes).
+    With changed (code -> new prereq groups), only those courses are re-evaluated
+    in each plan's stored contribution instead of recomputing the whole plan.
+    Call after the plans are flushed (ids exist); the caller commits.
+    """
+    if not plans:
+        return
+
+    ids = [plan_id for plan_id, _, _ in plans]
+    previous = {p.plan_id: p for p in PlanProgress.query.filter(PlanProgress.plan_id.in_(ids))}
+    course_maps: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    known_degrees: Dict[str, bool] = {}
+    delta: Counter = Counter()
+
+    for plan_id, degree, completed in plans:
+        old = previous.get(plan_id)
+        old_contrib = json.loads(old.contrib_json or "{}") if old is not None else None
+        if old_contrib is not None:
+            _add_contribution(delta, old.degree, old_contrib, -1)
+
+        if degree not in known_degrees:
+            known_degrees[degree] = degree_exists(degree)
+        if not known_degrees[degree]:
+            if old is not None:
+                db.session.delete(old)
+            continue
+
+        contrib = None
+        if changed is not None and old_contrib is not None and old.degree == degree:
+            contrib = retarget_contribution(old_contrib, set(completed), changed)
+        if contrib is None:
+            if degree not in course_maps:
+                course_maps[degree] = cached_course_map(load_required_courses(degree))
+            contrib = plan_contribution(course_maps[degree], set(completed))
+        _add_contribution(delta, degree, contrib, +1)
+
+        if old is None:
+            old = PlanProgress(plan_id=plan_id)
+            db.session.add(old)
+        old.degree = degree
+        old.contrib_json = json.dumps(contrib)
+
+    _apply_delta(delta)
+
+
+def rebuild_degree_stats(degree: str | None = None) -> int:
+    """
+    Recounts every saved plan (optionally one degree) against the current cached
+    prereqs, e.g. after an upgrade or a catalogue refresh. Returns how many plans were counted.
+    """
+    q = Plan.query
+    if degree is not None:
+        q = q.filter_by(degree=degree)
+
+    count = 0
+    batch: List[Tuple[int, str, List[str]]] = []
+    for plan in q.order_by(Plan.id).yield_per(REBUILD_BATCH_SIZE):
+        batch.append((plan.id, plan.degree, json.loads(plan.completed_json or "[]")))
+        if len(batch) >= REBUILD_BATCH_SIZE:
+            update_plan_progress(batch)
+            count += len(batch)
+            batch = []
+    update_plan_progress(batch)
+    count += len(batch)
+
+    db.session.commit()
+    return count
+
+
+def degrees_requiring(codes: Set[str]) -> List[str]:
+    return sorted(
+        p.stem for p in DEGREE_DIR.glob("*.json")
+        if codes & set(load_required_courses(p.stem))
+    )
+
+
+def pending_course_changes() -> int:
+    """Prereq changes not yet reflected in DegreeCourseStat."""
+    return CourseChange.query.filter_by(prereqs_changed=True, stats_applied=False).count()
+
+
+def apply_course_changes() -> Dict[str, Any]:
+    """
+    Brings the stats up to date with queued prereq changes (CourseChange rows).
+    Run outside the request path: after a crawl, or via POST /api/analytics/refresh.
+
+    Only plans that can be affected are touched: plans of degrees requiring a
+    changed course that haven't completed all of those courses (a completed
+    course's prereqs no longer matter to that plan). Within each plan only the
+    changed courses are re-evaluated, and only the stat rows that moved are written.
+    """
+    pending = CourseChange.query.filter_by(prereqs_changed=True, stats_applied=False).all()
+    if not pending:
+        return {"changes": 0, "codes": [], "plans_recounted": 0}
+
+    codes = {c.code for c in pending}
+    recounted = 0
+
+    for degree in degrees_requiring(codes):
+        changed_here = codes & set(load_required_courses(degree))
+        new_prereqs = {code: data["prereqs"] for code, data in cached_course_map(sorted(changed_here)).items()}
+        batch: List[Tuple[int, str, List[str]]] = []
+        for plan_id, completed_json in (
+            Plan.query.with_entities(Plan.id, Plan.completed_json)
+            .filter_by(degree=degree)
+            .order_by(Plan.id)
+            .yield_per(REBUILD_BATCH_SIZE)
+        ):
+            completed = json.loads(completed_json or "[]")
+            if changed_here <= set(completed):
+                continue
+            batch.append((plan_id, degree, completed))
+            if len(batch) >= REBUILD_BATCH_SIZE:
+                update_plan_progress(batch, new_prereqs)
+                recounted += len(batch)
+                batch = []
+        update_plan_progress(batch, new_prereqs)
+        recounted += len(batch)
+
+    for change in pending:
+        change.stats_applied = True
+    db.session.commit()
+
+    return {"changes": len(pending), "codes": sorted(codes), "plans_recounted": recounted}
+
+
+def degree_stats(degree: str, sort: str = "blocked", limit: int | None = None) -> List[Dict[str, Any]]:
+    """
+    Reads the materialized counts, highest first by sort
+    (completed | unlocked | blocked | missing).
+    """
+    column = getattr(DegreeCourseStat, STAT_FIELDS.get(sort, "blocked_count"))
+    q = DegreeCourseStat.query.filter_by(degree=degree).order_by(column.desc(), DegreeCourseStat.code)
+    if limit:
+        q = q.limit(limit)
+    return [row.to_dict() for row in q]
+
+
+def course_stat(degree: str, code: str) -> Dict[str, Any] | None:
+    row = DegreeCourseStat.query.filter_by(degree=degree, code=normalize_code(code)).first()
+    return row.to_dict() if row else None
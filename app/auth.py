@@ -0,0 +1,14 @@
+import hmac
+import os
+
+from flask import request
+
+
+def is_admin() -> bool:
+    """
+    Admin-only operations (cross-user plan export/import, analytics recounts) need
+    X-Admin-Token to match $PLANNER_ADMIN_TOKEN. With no token configured they are off.
+    """
+    token = os.getenv("PLANNER_ADMIN_TOKEN", "")
+    given = request.headers.get("X-Admin-Token", "")
+    return bool(token) and hmac.compare_digest(token, given)
@@ -0,0 +1,192 @@
+"""
+crawler.py
+Catalogue-wide crawl as a 3-stage pipeline:
+
+  fetch (async, threads for requests)  ->  parse (ProcessPoolExecutor)  ->  DB write (batched)
+
+Stages are joined by bounded asyncio queues, so a slow stage pushes back on
+the one before it instead of piling pages up in memory.
+
+Usage:
+  python -m app.crawler                  # every course in the default degree template
+  python -m app.crawler CMPT 141 CMPT145 # specific codes
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List
+
+from app.analytics import apply_course_changes
+from app.db import db
+from app.planner import COURSE_RE, normalize_code, parse_prereqs
+from app.scraper import _use_disk_cache, _write_cache, fetch_course_page, parse_course_page
+from app.services import _coursecache_upsert
+
+FETCH_CONCURRENCY = 8  # in-flight HTTP requests
+PARSE_WORKERS = os.cpu_count() or 2
+QUEUE_SIZE = 64  # max items waiting between two stages
+WRITE_BATCH_SIZE = 100  # CourseCache rows per commit
+
+_DONE = None  # end-of-stream marker passed down the queues
+
+
+def parse_fetched_page(fetched: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Runs in a worker process: BeautifulSoup extraction + prereq regexes.
+    """
+    payload = parse_course_page(fetched)
+    payload["prereqs"] = parse_prereqs(payload["raw_text"]) if payload["raw_text"] else []
+    return payload
+
+
+async def _fetch_stage(codes, parse_q: asyncio.Queue) -> None:
+    # codes is a shared iterator; each fetcher pulls the next code when it is free
+    for code in codes:
+        fetched = await asyncio.to_thread(fetch_course_page, code)
+        await parse_q.put(fetched)
+
+
+async def _parse_stage(pool: ProcessPoolExecutor, parse_q: asyncio.Queue, write_q: asyncio.Queue) -> None:
+    loop = asyncio.get_running_loop()
+    while True:
+        fetched = await parse_q.get()
+        if fetched is _DONE:
+            return
+        try:
+            payload = await loop.run_in_executor(pool, parse_fetched_page, fetched)
+        except Exception as e:
+            # one bad page must not take the stage down (and stall the queues behind it)
+            payload = {
+                "course_code": fetched["course_code"],
+                "source_url": fetched["source_url"],
+                "raw_text": "",
+                "not_found": True,
+                "prereqs": [],
+                "error": f"parse failed: {e!r}",
+            }
+        await write_q.put(payload)
+
+
+def _write_batch(batch: List[Dict[str, Any]]) -> List[str]:
+    """Writes one batch; returns codes whose cached prereqs changed."""
+    changed = []
+    use_cache = _use_disk_cache()
+    for payload in batch:
+        if payload.get("error"):
+            # network failure: keep whatever we had instead of recording a bogus "change"
+            continue
+        payload["from_cache"] = False
+        if use_cache:
+            _write_cache(payload["course_code"], {k: v for k, v in payload.items() if k != "prereqs"})
+        change = _coursecache_upsert(payload["course_code"], payload["source_url"], payload["raw_text"], payload["prereqs"])
+        if change and change.prereqs_changed:
+            changed.append(change.code)
+    db.session.commit()
+    return changed
+
+
+async def _write_stage(write_q: asyncio.Queue, batch_size: int, summary: Dict[str, Any]) -> None:
+    batch: List[Dict[str, Any]] = []
+    while True:
+        payload = await write_q.get()
+        if payload is not _DONE:
+            batch.append(payload)
+            if payload.get("error"):
+                summary["errors"] += 1
+            elif payload["not_found"]:
+                summary["missing"] += 1
+            else:
+                summary["ok"] += 1
+
+        if batch and (payload is _DONE or len(batch) >= batch_size):
+            # runs on the loop thread: the DB session is not shared with other threads
+            summary["prereqs_changed"].extend(_write_batch(batch))
+            batch = []
+
+        if payload is _DONE:
+            return
+
+
+async def crawl_courses_async(
+    codes: List[str],
+    fetch_concurrency: int = FETCH_CONCURRENCY,
+    parse_workers: int = PARSE_WORKERS,
+    queue_size: int = QUEUE_SIZE,
+    batch_size: int = WRITE_BATCH_SIZE,
+) -> Dict[str, Any]:
+    """
+    Crawls codes through the pipeline. Needs an app context (for the DB writes).
+    """
+    codes = list(dict.fromkeys(normalize_code(c) for c in codes if (c or "").strip()))
+    summary: Dict[str, Any] = {"requested": len(codes), "ok": 0, "missing": 0, "errors": 0, "prereqs_changed": []}
+    started = time.perf_counter()
+
+    parse_q: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    write_q: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    code_iter = iter(codes)
+
+    async def close_stages(fetchers, parsers):
+        # end-of-stream markers, once each upstream stage has drained
+        await asyncio.gather(*fetchers)
+        for _ in parsers:
+            await parse_q.put(_DONE)
+        await asyncio.gather(*parsers)
+        await write_q.put(_DONE)
+
+    with ProcessPoolExecutor(max_workers=parse_workers) as pool:
+        writer = asyncio.create_task(_write_stage(write_q, batch_size, summary))
+        parsers = [asyncio.create_task(_parse_stage(pool, parse_q, write_q)) for _ in range(parse_workers)]
+        fetchers = [asyncio.create_task(_fetch_stage(code_iter, parse_q)) for _ in range(fetch_concurrency)]
+        tasks = [writer, *parsers, *fetchers, asyncio.create_task(close_stages(fetchers, parsers))]
+
+        # supervise every stage: if any task dies, cancel the rest instead of
+        # leaving the others blocked on a queue nobody drains
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for t in tasks:
+                t.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    # analytics catch up once, after the whole crawl, for the changed courses only
+    summary["stats"] = apply_course_changes()
+    summary["seconds"] = round(time.perf_counter() - started, 3)
+    return summary
+
+
+def crawl_courses(codes: List[str], **kwargs) -> Dict[str, Any]:
+    """Sync wrapper around crawl_courses_async()."""
+    return asyncio.run(crawl_courses_async(codes, **kwargs))
+
+
+if __name__ == "__main__":
+    from app.init_db import create_app_for_db
+    from app.prereq_graph import validate_catalogue
+
+    args = " ".join(sys.argv[1:])
+    if args:
+        codes = [f"{subj} {num}" for subj, num in COURSE_RE.findall(args.upper())]
+    else:
+        degree_file = Path(__file__).resolve().parent / "degree" / "bsc_cs.json"
+        codes = json.loads(degree_file.read_text(encoding="utf-8")).get("required_courses", [])
+
+    app = create_app_for_db()
+    with app.app_context():
+        db.create_all()
+        print(crawl_courses(codes))
+
+        report = validate_catalogue()
+        print(
+            f"validation: {report['courses']} courses, {len(report['cycles'])} cycles, "
+            f"{len(report['dangling'])} dangling refs "
+            f"({len(report['depends_on_uncached'])} courses wait on them), {len(report['unreachable'])} unreachable "
+            f"({report['seconds']}s) - python -m app.prereq_graph for details"
+        )
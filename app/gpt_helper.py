@@ -1,14 +1,18 @@
 # It is here for the part that connects to the GPT API
 # This file summarizes the course material
 
-from openai import OpenAI
 import os
+import time
+
+from app.prompt_prep import PROMPT_TOKEN_BUDGET, estimate_tokens, prepare_description
 
 _client = None
 # Grabs the clients name
 def _get_client():
     global _client
     if _client is None:
+        # Imported here so workers that never summarize don't pay for the openai SDK
+        from openai import OpenAI
         # Uses os.getenv to check the project directories to searches if such client exists
         _client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
     return _client
@@ -28,17 +32,39 @@ Sys_Message = (
 # The 'desc' parameter is defined if the client wants to add a course description
 #It is currently set to None if not required by the client
 def summarize_course(course_code: str, desc: str | None = None) -> str:
+    return summarize_course_timed(course_code, desc)["summary"]
+
+
+# Same as summarize_course, but also returns what the call cost:
+# {summary, est_input_tokens, est_input_tokens_untrimmed, prompt_tokens, completion_tokens, latency_ms}
+def summarize_course_timed(course_code: str, desc: str | None = None, budget: int = PROMPT_TOKEN_BUDGET) -> dict:
+    stats = {
+        "summary": "",
+        "est_input_tokens": 0,
+        "est_input_tokens_untrimmed": 0,
+        "prompt_tokens": None,
+        "completion_tokens": None,
+        "latency_ms": None,
+    }
     # Ensures the course code or name is consistently the same format overall each input
     course_code = (course_code or "").strip().upper()
     if not course_code:
-        return "Please provide a course code (e.g., CMPT 270)."
+        stats["summary"] = "Please provide a course code (e.g., CMPT 270)."
+        return stats
     # Holds users entered data
     user = f"Course: {course_code}\n"
+    untrimmed = user
     # If a description is entered updates the 'user' variable
+    # (trimmed to the token budget first; only whole official sentences are kept)
     if desc:
-        user += f"Description: {desc}\n"
+        trimmed, _ = prepare_description(desc, budget)
+        untrimmed += f"Description: {desc}\n"
+        user += f"Description: {trimmed}\n"
+    stats["est_input_tokens"] = estimate_tokens(Sys_Message + user)
+    stats["est_input_tokens_untrimmed"] = estimate_tokens(Sys_Message + untrimmed)
     try:
         client = _get_client()
+        started = time.perf_counter()
         # Calls the OPENAI API through the client object
         # Tell the API what detail to further send forward to OPENAI
         resp = client.chat.completions.create(
@@ -54,10 +80,13 @@ def summarize_course(course_code: str, desc: str | None = None) -> str:
             #Sets teh max length of the gpt reply to 240
             max_tokens=240,
         )
+        stats["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        if resp.usage:
+            stats["prompt_tokens"] = resp.usage.prompt_tokens
+            stats["completion_tokens"] = resp.usage.completion_tokens
         # Takes the first gpt response and strips any white spaces or extra lines
-        return resp.choices[0].message.content.strip()
+        stats["summary"] = resp.choices[0].message.content.strip()
     # For the odd reason if gpt crashes
     except Exception as e:
-        return "Sorry could not generate a summary right now. Please Try again in a minute."
-
-
+        stats["summary"] = "Sorry could not generate a summary right now. Please Try again in a minute."
+    return stats
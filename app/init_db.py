@@ -1,15 +1,64 @@
 from flask import Flask
+from sqlalchemy import inspect, text
+
+from app import models  # noqa: F401  (registers the tables with db)
+from app.analytics import rebuild_degree_stats
 from app.db import db
 
+# Columns added to tables that existed before; db.create_all() only creates
+# missing tables, so upgrade_db() adds these to older planner.db files.
+# (table, column, DDL for ALTER TABLE ... ADD COLUMN)
+ADDED_COLUMNS = [
+    ("plans", "user_id", "VARCHAR(64) NOT NULL DEFAULT ''"),
+    ("plans", "degree", "VARCHAR(40) NOT NULL DEFAULT 'bsc_cs'"),
+    # rows without a hash get one on their next upsert
+    ("course_cache", "content_hash", "VARCHAR(64) NOT NULL DEFAULT ''"),
+]
+
+ADDED_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS ix_plans_user_id ON plans (user_id)",
+]
+
+
 def create_app_for_db():
-    app = Flask(__name__)
+    # fixed import name: under `python -m app.init_db` __name__ is "__main__", which
+    # would put the database in app/instance/ instead of the app's instance/
+    app = Flask("app")
     app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///planner.db"
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
     db.init_app(app)
     return app
 
+
+def upgrade_db():
+    """
+    Creates missing tables and adds missing columns / indexes. Safe to run repeatedly.
+    Needs an app context. Returns the "table.column" names that were added.
+    """
+    db.create_all()
+
+    added = []
+    inspector = inspect(db.engine)
+    with db.engine.begin() as conn:
+        for table, column, ddl in ADDED_COLUMNS:
+            existing = {c["name"] for c in inspector.get_columns(table)}
+            if column not in existing:
+                conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+                added.append(f"{table}.{column}")
+        for stmt in ADDED_INDEXES:
+            conn.execute(text(stmt))
+
+    if "plans.degree" in added:
+        # plans saved before analytics existed: count them once
+        rebuild_degree_stats()
+
+    return added
+
+
 if __name__ == "__main__":
     app = create_app_for_db()
     with app.app_context():
-        db.create_all()
-        print("✅ planner.db created / tables ensured")
\ No newline at end of file
+        added = upgrade_db()
+        print("✅ planner.db created / tables ensured")
+        if added:
+            print("   added columns:", ", ".join(added))
@@ -1,3 +1,4 @@
+import json
 from datetime import datetime
 from app.db import db
 
@@ -6,7 +7,10 @@ class Plan(db.Model):
     __tablename__ = "plans"
 
     id = db.Column(db.Integer, primary_key=True)
+    # owner of the plan; "" is the shared/anonymous bucket used by the planner UI
+    user_id = db.Column(db.String(64), nullable=False, default="", index=True)
     name = db.Column(db.String(120), nullable=False, default="My Plan")
+    degree = db.Column(db.String(40), nullable=False, default="bsc_cs")  # app/degree/<degree>.json
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
 
     # stored as JSON string for simplicity
@@ -16,7 +20,9 @@ class Plan(db.Model):
     def to_dict(self):
         return {
             "id": self.id,
+            "user_id": self.user_id,
             "name": self.name,
+            "degree": self.degree,
             "created_at": self.created_at.isoformat(),
             "completed_json": self.completed_json,
             "notes": self.notes,
@@ -33,6 +39,7 @@ class CourseCache(db.Model):
     source_url = db.Column(db.Text, nullable=False, default="")
     raw_text = db.Column(db.Text, nullable=False, default="")
     prereqs_json = db.Column(db.Text, nullable=False, default="[]")  # OR-of-AND groups as JSON string
+    content_hash = db.Column(db.String(64), nullable=False, default="")  # sha256 of raw_text + prereqs
 
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
 
@@ -42,5 +49,98 @@ class CourseCache(db.Model):
             "source_url": self.source_url,
             "raw_text": self.raw_text,
             "prereqs_json": self.prereqs_json,
+            "content_hash": self.content_hash,
             "updated_at": self.updated_at.isoformat(),
-        }
\ No newline at end of file
+        }
+
+
+class CourseChange(db.Model):
+    """
+    One detected change to a cached course (new course, text or prereq change).
+    id doubles as the feed version: clients poll with ?since=<last id>.
+    """
+    __tablename__ = "course_changes"
+
+    id = db.Column(db.Integer, primary_key=True)
+    code = db.Column(db.String(20), nullable=False, index=True)
+
+    old_hash = db.Column(db.String(64), nullable=False, default="")  # "" for a newly cached course
+    new_hash = db.Column(db.String(64), nullable=False)
+    old_prereqs_json = db.Column(db.Text, nullable=True)  # None for a newly cached course
+    new_prereqs_json = db.Column(db.Text, nullable=False, default="[]")
+
+    text_changed = db.Column(db.Boolean, nullable=False, default=False)
+    prereqs_changed = db.Column(db.Boolean, nullable=False, default=False)
+    # set once analytics.apply_course_changes() has recounted the plans this affects
+    stats_applied = db.Column(db.Boolean, nullable=False, default=False, index=True)
+    detected_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def to_dict(self):
+        return {
+            "version": self.id,
+            "code": self.code,
+            "old_hash": self.old_hash,
+            "new_hash": self.new_hash,
+            "old_prereqs": json.loads(self.old_prereqs_json) if self.old_prereqs_json is not None else None,
+            "new_prereqs": json.loads(self.new_prereqs_json or "[]"),
+            "text_changed": self.text_changed,
+            "prereqs_changed": self.prereqs_changed,
+            "detected_at": self.detected_at.isoformat(),
+        }
+
+
+class PlanProgress(db.Model):
+    """
+    What one saved plan currently contributes to DegreeCourseStat,
+    so a re-save can subtract exactly what it added before.
+    """
+    __tablename__ = "plan_progress"
+
+    plan_id = db.Column(db.Integer, db.ForeignKey("plans.id"), primary_key=True)
+    degree = db.Column(db.String(40), nullable=False)
+    # {"completed": [...], "unlocked": [...], "blocked": [...], "missing": [...]}
+    contrib_json = db.Column(db.Text, nullable=False, default="{}")
+
+
+class DegreeCourseStat(db.Model):
+    """
+    Materialized per-degree course counts over all saved plans (kept up to date on save).
+    """
+    __tablename__ = "degree_course_stats"
+
+    degree = db.Column(db.String(40), primary_key=True)
+    code = db.Column(db.String(20), primary_key=True)
+
+    completed_count = db.Column(db.Integer, nullable=False, default=0)
+    unlocked_count = db.Column(db.Integer, nullable=False, default=0)
+    blocked_count = db.Column(db.Integer, nullable=False, default=0)
+    # plans where this course is a missing prereq of something they are blocked on
+    missing_count = db.Column(db.Integer, nullable=False, default=0)
+
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def to_dict(self):
+        return {
+            "code": self.code,
+            "completed": self.completed_count,
+            "unlocked": self.unlocked_count,
+            "blocked": self.blocked_count,
+            "missing": self.missing_count,
+            "updated_at": self.updated_at.isoformat(),
+        }
+
+
+class SummaryLog(db.Model):
+    """
+    One row per GPT summary request: prompt size (estimated + as billed) and latency.
+    """
+    __tablename__ = "summary_log"
+
+    id = db.Column(db.Integer, primary_key=True)
+    course_code = db.Column(db.String(20), nullable=False)
+    est_input_tokens = db.Column(db.Integer, nullable=False, default=0)
+    est_input_tokens_untrimmed = db.Column(db.Integer, nullable=False, default=0)
+    prompt_tokens = db.Column(db.Integer, nullable=True)  # from the API response, None if the call failed
+    completion_tokens = db.Column(db.Integer, nullable=True)
+    latency_ms = db.Column(db.Float, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
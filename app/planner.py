@@ -154,4 +154,118 @@ def locked_courses_with_reasons(course_map: Dict[str, Dict[str, Any]], completed
         missing = missing_prereqs(prereq_groups, completed_norm)
         locked.append({"course": code_norm, "missing": missing})
 
-    return sorted(locked, key=lambda x: x["course"])
\ No newline at end of file
+    return sorted(locked, key=lambda x: x["course"])
+
+# ---------------------------
+# What-if simulation (compiled prereqs as bitmasks)
+# ---------------------------
+
+class CompiledPrereqs:
+    """
+    course_map compiled once so many completed-sets can be checked cheaply.
+    Every code gets a bit (in sorted order); each OR-group is an int mask,
+    and a group is satisfied when (group & done) == group.
+    """
+
+    def __init__(self, course_map: Dict[str, Dict[str, Any]]):
+        codes: Set[str] = set()
+        normalized: Dict[str, List[List[str]]] = {}
+        for code, data in course_map.items():
+            code_norm = normalize_code(code)
+            groups = [[normalize_code(c) for c in g] for g in data.get("prereqs", [])]
+            normalized[code_norm] = groups
+            codes.add(code_norm)
+            codes.update(c for g in groups for c in g)
+
+        self.codes: List[str] = sorted(codes)
+        self.index: Dict[str, int] = {c: i for i, c in enumerate(self.codes)}
+
+        # (course bit, [group masks]); no prereqs -> [0], which is always satisfied
+        self.courses: List[Tuple[int, List[int]]] = []
+        for code_norm in sorted(normalized):
+            groups = normalized[code_norm]
+            masks = [self.mask(g) for g in groups] if groups else [0]
+            self.courses.append((1 << self.index[code_norm], masks))
+
+    def mask(self, codes) -> int:
+        """Codes -> bitmask (codes outside the map are ignored)."""
+        m = 0
+        for c in codes:
+            i = self.index.get(normalize_code(c))
+            if i is not None:
+                m |= 1 << i
+        return m
+
+    def codes_of(self, mask: int) -> List[str]:
+        """Bitmask -> sorted codes."""
+        out = []
+        i = 0
+        while mask:
+            if mask & 1:
+                out.append(self.codes[i])
+            mask >>= 1
+            i += 1
+        return out
+
+    def unlocked_mask(self, done: int) -> int:
+        """Courses not in done whose prereqs done satisfies (same rule as unlocked_courses)."""
+        unlocked = 0
+        for bit, groups in self.courses:
+            if done & bit:
+                continue
+            for g in groups:
+                if g & done == g:
+                    unlocked |= bit
+                    break
+        return unlocked
+
+    def course_mask(self) -> int:
+        m = 0
+        for bit, _ in self.courses:
+            m |= bit
+        return m
+
+
+def simulate_bundles(
+    compiled: CompiledPrereqs,
+    completed: Set[str],
+    bundles: List[List[str]],
+) -> Dict[str, Any]:
+    """
+    For each candidate bundle (courses taken this term on top of completed),
+    what becomes unlocked next term that wasn't before, and what stays blocked.
+    Bundle courses the student can't take yet count as not taken.
+    Results are ranked by how much each bundle unlocks (ties: fewer not-eligible
+    courses, then smaller bundle first).
+    """
+    all_courses = compiled.course_mask()
+    base = compiled.mask(completed)
+    base_unlocked = compiled.unlocked_mask(base)
+
+    results: List[Dict[str, Any]] = []
+    for i, bundle in enumerate(bundles):
+        taking = compiled.mask(bundle)
+        # bundle courses whose prereqs the base completed set doesn't meet yet:
+        # they can't be taken this term, so they don't count towards next term
+        not_eligible = taking & all_courses & ~base & ~base_unlocked
+        done = base | (taking & ~not_eligible)
+        unlocked = compiled.unlocked_mask(done)
+        newly = unlocked & ~base_unlocked
+        blocked = all_courses & ~done & ~unlocked
+
+        results.append({
+            "index": i,
+            "bundle": sorted({normalize_code(c) for c in bundle}),
+            "newly_unlocked": compiled.codes_of(newly),
+            "still_blocked": compiled.codes_of(blocked),
+            "not_eligible": compiled.codes_of(not_eligible),
+        })
+
+    results.sort(key=lambda r: (-len(r["newly_unlocked"]), len(r["not_eligible"]), len(r["bundle"]), r["index"]))
+    for rank, r in enumerate(results, start=1):
+        r["rank"] = rank
+
+    return {
+        "base_unlocked": compiled.codes_of(base_unlocked),
+        "results": results,
+    }
@@ -0,0 +1,233 @@
+"""
+prereq_graph.py
+Validates the whole cached prerequisite graph (regex parsing can produce junk).
+
+Finds, in time linear in courses + prereq references:
+  - self references   CMPT 214 listed as its own prereq
+  - cycles            strongly connected components (Tarjan), size > 1 or self loop
+  - dangling refs     prereq codes we have no official text for (often real courses
+                      the crawl never fetched, e.g. MATH 110)
+  - uncached deps     courses reachable only through dangling refs; reported on
+                      their own, since those refs are usually just not crawled yet
+  - unreachable       courses no sequence of completions can ever unlock, even
+                      taking every dangling ref as completable
+  - degree problems   required courses that are uncached / unreachable, or that
+                      need courses outside the degree template
+
+Usage:
+  python -m app.prereq_graph        # prints the report for planner.db
+"""
+
+import json
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, List, Set
+
+from app.analytics import DEGREE_DIR, load_required_courses
+from app.models import CourseCache
+from app.planner import normalize_code
+
+PrereqMap = Dict[str, List[List[str]]]  # code -> OR-of-AND groups
+
+
+def strongly_connected_components(graph: Dict[str, List[str]]) -> List[List[str]]:
+    """
+    Tarjan's algorithm, iterative (the catalogue is deep enough to hit the recursion limit).
+    graph: node -> successors. Nodes only referenced as successors are included.
+    """
+    index: Dict[str, int] = {}
+    low: Dict[str, int] = {}
+    on_stack: Set[str] = set()
+    stack: List[str] = []
+    components: List[List[str]] = []
+    counter = 0
+
+    nodes = list(graph)
+    nodes.extend(s for succs in graph.values() for s in succs if s not in graph)
+
+    for root in nodes:
+        if root in index:
+            continue
+
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(graph.get(root, ())))]
+
+        while work:
+            node, succs = work[-1]
+            advanced = False
+            for succ in succs:
+                if succ not in index:
+                    index[succ] = low[succ] = counter
+                    counter += 1
+                    stack.append(succ)
+                    on_stack.add(succ)
+                    work.append((succ, iter(graph.get(succ, ()))))
+                    advanced = True
+                    break
+                if succ in on_stack:
+                    low[node] = min(low[node], index[succ])
+            if advanced:
+                continue
+
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+
+            if low[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(sorted(component))
+
+    return components
+
+
+def obtainable_courses(prereqs: PrereqMap, available: Set[str]) -> Set[str]:
+    """
+    Which courses can eventually be completed, starting from nothing.
+    available: codes that count as takeable leaves even without an entry in prereqs
+    (e.g. courses outside the graph you want to assume are fine).
+
+    AND-OR propagation: each group keeps a count of members not yet obtainable;
+    when it hits 0 its course becomes obtainable. Every reference is touched once.
+    """
+    obtained: Set[str] = set()
+    queue: deque = deque()
+
+    group_missing: List[int] = []
+    group_course: List[str] = []
+    waiting: Dict[str, List[int]] = {}  # code -> groups that still need it
+
+    def obtain(code: str):
+        if code not in obtained:
+            obtained.add(code)
+            queue.append(code)
+
+    for code in available:
+        if code not in prereqs:
+            obtain(code)
+
+    for code, groups in prereqs.items():
+        if not groups:
+            obtain(code)
+            continue
+        for group in groups:
+            members = set(group)
+            gid = len(group_missing)
+            group_missing.append(len(members))
+            group_course.append(code)
+            if not members:
+                obtain(code)
+            for m in members:
+                waiting.setdefault(m, []).append(gid)
+
+    while queue:
+        code = queue.popleft()
+        for gid in waiting.get(code, ()):
+            group_missing[gid] -= 1
+            if group_missing[gid] == 0:
+                obtain(group_course[gid])
+
+    return obtained
+
+
+def validate_graph(prereqs: PrereqMap, degrees: Dict[str, List[str]] | None = None) -> Dict[str, Any]:
+    """
+    prereqs: every course we have official text for -> its prereq groups.
+    degrees: degree id -> required course codes.
+    """
+    started = time.perf_counter()
+    prereqs = {
+        normalize_code(code): [[normalize_code(c) for c in g] for g in groups]
+        for code, groups in prereqs.items()
+    }
+
+    graph = {code: sorted({c for g in groups for c in g}) for code, groups in prereqs.items()}
+
+    self_references = sorted(code for code, succs in graph.items() if code in succs)
+
+    dangling: Dict[str, List[str]] = {}
+    for code, succs in graph.items():
+        for s in succs:
+            if s not in prereqs:
+                dangling.setdefault(s, []).append(code)
+
+    cycles = [
+        comp for comp in strongly_connected_components(graph)
+        if len(comp) > 1 or comp[0] in self_references
+    ]
+    in_cycle = {c for comp in cycles for c in comp}
+
+    obtainable = obtainable_courses(prereqs, set())
+    # second pass: what would be fine if every dangling code were takeable
+    obtainable_if_dangling_ok = obtainable_courses(prereqs, set(dangling))
+
+    # not provably blocked: they only wait on courses we have no text for
+    depends_on_uncached = sorted(obtainable_if_dangling_ok - obtainable - set(dangling))
+
+    unreachable = []
+    for code in sorted(set(prereqs) - obtainable_if_dangling_ok):
+        reason = "cycle" if code in in_cycle else "depends_on_unreachable"
+        unreachable.append({"course": code, "reason": reason})
+    unreachable_codes = {u["course"] for u in unreachable}
+
+    degree_reports: Dict[str, Any] = {}
+    for degree, required in (degrees or {}).items():
+        required = [normalize_code(c) for c in required]
+        within = obtainable_courses({c: prereqs[c] for c in required if c in prereqs}, set())
+        report = {
+            "uncached": [c for c in required if c not in prereqs],
+            "unreachable": [c for c in required if c in unreachable_codes],
+            # don't block completable: crawl the missing prereqs to confirm
+            "depends_on_uncached": [c for c in required if c in depends_on_uncached],
+            # reachable in the catalogue, but not by ticking only this template's courses
+            "needs_outside_courses": [c for c in required if c in prereqs and c not in within and c not in unreachable_codes],
+        }
+        report["completable"] = not report["uncached"] and not report["unreachable"]
+        degree_reports[degree] = report
+
+    return {
+        "courses": len(prereqs),
+        "references": sum(len(s) for s in graph.values()),
+        "self_references": self_references,
+        "cycles": cycles,
+        "dangling": {code: sorted(refs) for code, refs in sorted(dangling.items())},
+        "depends_on_uncached": depends_on_uncached,
+        "unreachable": unreachable,
+        "degrees": degree_reports,
+        "seconds": round(time.perf_counter() - started, 4),
+    }
+
+
+def load_prereq_map() -> PrereqMap:
+    """Every cached course with official text (not-found rows count as missing)."""
+    rows = CourseCache.query.with_entities(CourseCache.code, CourseCache.raw_text, CourseCache.prereqs_json).all()
+    return {code: json.loads(prereqs_json or "[]") for code, raw_text, prereqs_json in rows if (raw_text or "").strip()}
+
+
+def load_degrees() -> Dict[str, List[str]]:
+    return {p.stem: load_required_courses(p.stem) for p in sorted(Path(DEGREE_DIR).glob("*.json"))}
+
+
+def validate_catalogue() -> Dict[str, Any]:
+    """Runs validate_graph() over CourseCache + all degree templates. Needs an app context."""
+    return validate_graph(load_prereq_map(), load_degrees())
+
+
+if __name__ == "__main__":
+    from app.db import db
+    from app.init_db import create_app_for_db
+
+    app = create_app_for_db()
+    with app.app_context():
+        db.create_all()
+        print(json.dumps(validate_catalogue(), indent=2))
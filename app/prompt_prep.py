@@ -0,0 +1,180 @@
+"""
+prompt_prep.py
+Shrinks official catalogue text before it goes into the summary prompt.
+
+Deterministic and extractive: sentences are only dropped, deduped or kept,
+never rewritten, so the prompt still contains nothing but official text.
+The prerequisite span (planner.extract_prereq_line) is kept whole, as are
+other restriction sentences; description sentences then fill the rest of the
+token budget in order, stopping at the first one that does not fit; notes go
+last; fee boilerplate is dropped.
+
+Benchmark over the cached courses:
+  python -m app.prompt_prep            # uses planner.db
+  python -m app.prompt_prep --budget 250
+"""
+
+import os
+import re
+import sys
+from typing import Any, Dict, List, Tuple
+
+from app.planner import extract_prereq_line
+
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "350"))
+
+CHARS_PER_TOKEN = 4  # rough English average for OpenAI tokenizers; good enough for budgeting
+
+SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+(?=[A-Z(])|\s+(?=Note:|Costs in addition)")
+# a split right after one of these is not a sentence end ("e.g. Python", "Dr. Smith")
+ABBREVIATION_RE = re.compile(r"\b(?:e\.g|i\.e|etc|vs|cf|approx|incl|Dr|Mr|Ms|St|Ph\.D|No)\.$", re.IGNORECASE)
+PREREQ_HEAD_RE = re.compile(r"Prerequisite\(s\)\s*:", re.IGNORECASE)
+
+BOILERPLATE_RE = re.compile(
+    r"^(Costs in addition to tuition|Additional (course )?fees?|Fees? in addition)",
+    re.IGNORECASE,
+)
+PREREQ_RE = re.compile(r"prerequisite|corequisite|restriction|permission of", re.IGNORECASE)
+NOTE_RE = re.compile(r"^Note:|students with credit for|may not take this course", re.IGNORECASE)
+
+# lower = kept first
+TIER_PREREQ = 0
+TIER_DESCRIPTION = 1
+TIER_NOTE = 2
+
+
+def estimate_tokens(text: str) -> int:
+    if not text:
+        return 0
+    return max(1, round(len(text) / CHARS_PER_TOKEN))
+
+
+def split_sentences(text: str) -> List[str]:
+    text = re.sub(r"\s+", " ", text or "").strip()
+    if not text:
+        return []
+    sentences: List[str] = []
+    for piece in SENTENCE_SPLIT_RE.split(text):
+        piece = piece.strip()
+        if not piece:
+            continue
+        if sentences and ABBREVIATION_RE.search(sentences[-1]):
+            sentences[-1] += " " + piece
+        else:
+            sentences.append(piece)
+    return sentences
+
+
+def split_units(text: str) -> List[str]:
+    """
+    split_sentences(), except the whole "Prerequisite(s): ..." span comes back as
+    one unit (the same span planner.parse_prereqs() reads), in its original place.
+    """
+    text = re.sub(r"\s+", " ", text or "").strip()
+    head = PREREQ_HEAD_RE.search(text)
+    line = extract_prereq_line(text)
+    if not head or not line:
+        return split_sentences(text)
+
+    end = text.index(line, head.end()) + len(line)
+    return split_sentences(text[:head.start()]) + [text[head.start():end]] + split_sentences(text[end:])
+
+
+def _tier(sentence: str) -> int | None:
+    if BOILERPLATE_RE.search(sentence):
+        return None
+    if PREREQ_RE.search(sentence):
+        return TIER_PREREQ
+    if NOTE_RE.search(sentence):
+        return TIER_NOTE
+    return TIER_DESCRIPTION
+
+
+def prepare_description(text: str, budget: int = PROMPT_TOKEN_BUDGET) -> Tuple[str, Dict[str, Any]]:
+    """
+    Returns (trimmed text, stats). Kept sentences stay in their original order.
+    """
+    sentences = split_units(text)
+
+    seen = set()
+    candidates: List[Tuple[int, int, str]] = []  # (tier, position, sentence)
+    dropped_boilerplate = 0
+    dropped_duplicates = 0
+    for pos, sentence in enumerate(sentences):
+        key = re.sub(r"[^a-z0-9]+", " ", sentence.lower()).strip()
+        if key in seen:
+            dropped_duplicates += 1
+            continue
+        seen.add(key)
+
+        tier = _tier(sentence)
+        if tier is None:
+            dropped_boilerplate += 1
+            continue
+        candidates.append((tier, pos, sentence))
+
+    kept: List[Tuple[int, str]] = []
+    used = 0
+    dropped_budget = 0
+    full = False
+    for tier, pos, sentence in sorted(candidates):
+        cost = estimate_tokens(sentence) + 1  # + joining space
+        if tier == TIER_PREREQ:
+            kept.append((pos, sentence))
+            used += cost
+        elif full or used + cost > budget:
+            # no skipping ahead to a shorter sentence further down: the kept
+            # description stays a prefix of the original, not a patchwork
+            full = True
+            dropped_budget += 1
+        else:
+            kept.append((pos, sentence))
+            used += cost
+
+    trimmed = " ".join(sentence for _, sentence in sorted(kept))
+
+    return trimmed, {
+        "input_tokens_before": estimate_tokens(re.sub(r"\s+", " ", text or "").strip()),
+        "input_tokens_after": estimate_tokens(trimmed),
+        "sentences": len(sentences),
+        "dropped_boilerplate": dropped_boilerplate,
+        "dropped_duplicates": dropped_duplicates,
+        "dropped_budget": dropped_budget,
+    }
+
+
+def benchmark(texts: List[str], budget: int = PROMPT_TOKEN_BUDGET) -> Dict[str, Any]:
+    """Average estimated description tokens before/after prepare_description()."""
+    texts = [t for t in texts if (t or "").strip()]
+    if not texts:
+        return {"courses": 0}
+
+    before = after = 0
+    for t in texts:
+        _, stats = prepare_description(t, budget)
+        before += stats["input_tokens_before"]
+        after += stats["input_tokens_after"]
+
+    return {
+        "courses": len(texts),
+        "budget": budget,
+        "avg_tokens_before": round(before / len(texts), 1),
+        "avg_tokens_after": round(after / len(texts), 1),
+        "reduction_pct": round(100 * (before - after) / before, 1) if before else 0.0,
+    }
+
+
+if __name__ == "__main__":
+    from app.db import db
+    from app.init_db import create_app_for_db
+    from app.models import CourseCache
+
+    budget = PROMPT_TOKEN_BUDGET
+    if "--budget" in sys.argv:
+        budget = int(sys.argv[sys.argv.index("--budget") + 1])
+
+    app = create_app_for_db()
+    with app.app_context():
+        db.create_all()
+        texts = [row.raw_text for row in CourseCache.query.all()]
+    print(benchmark(texts, budget))
@@ -0,0 +1,86 @@
+from flask import Blueprint, request, jsonify
+from sqlalchemy import func
+
+from app.analytics import (
+    apply_course_changes,
+    course_stat,
+    degree_exists,
+    degree_stats,
+    pending_course_changes,
+    rebuild_degree_stats,
+)
+from app.auth import is_admin
+from app.db import db
+from app.models import SummaryLog
+
+# "analytics" route group: materialized degree stats + summary cost stats
+bp = Blueprint("analytics", __name__)
+
+
+# ---------------------------
+# API: Degree analytics (materialized, updated on plan save)
+# ---------------------------
+
+@bp.route("/api/analytics/<degree>/courses", methods=["GET"])
+def api_analytics_courses(degree):
+    if not degree_exists(degree):
+        return jsonify({"error": "Degree template not found"}), 404
+
+    sort = request.args.get("sort", "blocked")
+    limit = request.args.get("limit", type=int)
+    return jsonify({
+        "degree": degree,
+        "sort": sort,
+        # catalogue prereq changes not yet applied (see /api/analytics/refresh)
+        "pending_changes": pending_course_changes(),
+        "courses": degree_stats(degree, sort, limit),
+    })
+
+
+@bp.route("/api/analytics/<degree>/courses/<path:code>", methods=["GET"])
+def api_analytics_course(degree, code):
+    stat = course_stat(degree, code)
+    if not stat:
+        return jsonify({"error": "No data for this course"}), 404
+    return jsonify({"degree": degree, **stat})
+
+
+@bp.route("/api/analytics/summaries", methods=["GET"])
+def api_analytics_summaries():
+    """Average prompt size and latency of GPT summaries (from SummaryLog)."""
+    row = db.session.query(
+        func.count(SummaryLog.id),
+        func.avg(SummaryLog.est_input_tokens),
+        func.avg(SummaryLog.est_input_tokens_untrimmed),
+        func.avg(SummaryLog.prompt_tokens),
+        func.avg(SummaryLog.latency_ms),
+    ).one()
+
+    def _round(v):
+        return round(v, 1) if v is not None else None
+
+    return jsonify({
+        "requests": row[0],
+        "avg_est_input_tokens": _round(row[1]),
+        "avg_est_input_tokens_untrimmed": _round(row[2]),
+        "avg_prompt_tokens": _round(row[3]),
+        "avg_latency_ms": _round(row[4]),
+    })
+
+
+@bp.route("/api/analytics/rebuild", methods=["POST"])
+def api_analytics_rebuild():
+    # recounts every saved plan: admin only, like the other cross-user operations
+    if not is_admin():
+        return jsonify({"error": "Rebuilding analytics requires an admin token"}), 403
+    payload = request.get_json(silent=True) or {}
+    counted = rebuild_degree_stats(payload.get("degree"))
+    return jsonify({"ok": True, "plans": counted})
+
+
+@bp.route("/api/analytics/refresh", methods=["POST"])
+def api_analytics_refresh():
+    if not is_admin():
+        return jsonify({"error": "Refreshing analytics requires an admin token"}), 403
+    # apply queued catalogue prereq changes to the stats (affected plans only)
+    return jsonify({"ok": True, **apply_course_changes()})
@@ -0,0 +1,157 @@
+from flask import Blueprint, request, jsonify
+import json
+from pathlib import Path
+
+from app.planner import (
+    CompiledPrereqs,
+    unlocked_courses,
+    locked_courses_with_reasons,
+    normalize_code,
+    simulate_bundles,
+)
+from app.prereq_graph import validate_catalogue
+from app.services import (
+    build_degree_course_map,
+    bulk_scrape_courses,
+    planner_status,
+    course_changes,
+)
+
+# "planner" route group: degree template, course cache, planner + catalogue APIs
+bp = Blueprint("planner", __name__)
+
+DEGREE_DIR = Path(__file__).resolve().parent / "degree"
+DEFAULT_DEGREE_FILE = DEGREE_DIR / "bsc_cs.json"
+MAX_SIMULATION_BUNDLES = 1000
+
+
+# ---------------------------
+# API: Degree + Planner
+# ---------------------------
+
+@bp.route("/api/degree/bsci_cs", methods=["GET"])
+def api_degree_bsci_cs():
+    if not DEFAULT_DEGREE_FILE.exists():
+        return jsonify({"error": "Degree template not found", "path": str(DEFAULT_DEGREE_FILE)}), 404
+
+    degree = json.loads(DEFAULT_DEGREE_FILE.read_text(encoding="utf-8"))
+    return jsonify(degree)
+
+
+@bp.route("/api/courses/bulk_scrape", methods=["POST"])
+def api_courses_bulk_scrape():
+    payload = request.get_json(silent=True) or {}
+    codes = payload.get("codes", [])
+    codes = [normalize_code(c) for c in codes if (c or "").strip()]
+    if not codes:
+        return jsonify({"error": "No codes provided"}), 400
+
+    result = bulk_scrape_courses(codes)
+    return jsonify(result)
+
+
+@bp.route("/api/catalogue/changes", methods=["GET"])
+def api_catalogue_changes():
+    """
+    Change feed: ?since=<version>&limit=&code=&prereqs_only=1
+    Poll with since = the last version you saw.
+    """
+    since = request.args.get("since", 0, type=int)
+    limit = min(request.args.get("limit", 500, type=int), 5000)
+    code = request.args.get("code")
+    prereqs_only = request.args.get("prereqs_only") in ("1", "true")
+
+    changes = course_changes(since, limit, code, prereqs_only)
+    return jsonify({
+        "since": since,
+        "next_since": changes[-1]["version"] if changes else since,
+        "changes": changes,
+    })
+
+
+@bp.route("/api/catalogue/validate", methods=["GET"])
+def api_catalogue_validate():
+    # cycles / dangling refs / unreachable courses / degree templates that can't be completed
+    return jsonify(validate_catalogue())
+
+
+@bp.route("/api/planner/status", methods=["POST"])
+def api_planner_status():
+    payload = request.get_json(silent=True) or {}
+    completed = payload.get("completed", [])
+    completed_set = {normalize_code(c) for c in completed}
+
+    degree = json.loads(DEFAULT_DEGREE_FILE.read_text(encoding="utf-8"))
+    required = [normalize_code(c) for c in degree.get("required_courses", [])]
+
+    status = planner_status(required, completed_set)
+    return jsonify(status)
+
+
+# Keep the old endpoint so older clients/UI don't break.
+# Also allow GET to return a helpful message (curl mistakes) rather than a confusing 405.
+@bp.route("/api/planner/unlocked", methods=["POST", "GET"])
+def api_planner_unlocked():
+    if request.method == "GET":
+        return (
+            jsonify(
+                {
+                    "error": "Use POST with JSON body",
+                    "example": {"completed": ["CMPT 141", "CMPT 145"]},
+                }
+            ),
+            405,
+        )
+
+    payload = request.get_json(silent=True) or {}
+    completed = payload.get("completed", [])
+    completed_set = {normalize_code(c) for c in completed}
+
+    degree = json.loads(DEFAULT_DEGREE_FILE.read_text(encoding="utf-8"))
+    required = [normalize_code(c) for c in degree.get("required_courses", [])]
+
+    course_map = build_degree_course_map(required)
+
+    unlocked = unlocked_courses(course_map, completed_set)
+    locked = locked_courses_with_reasons(course_map, completed_set)
+
+    return jsonify(
+        {
+            "required_count": len(required),
+            "completed_count": len(completed_set),
+            "unlocked": unlocked,
+            "locked": locked,
+        }
+    )
+
+
+def _is_code_list(value) -> bool:
+    return isinstance(value, list) and all(isinstance(c, str) for c in value)
+
+
+@bp.route("/api/planner/simulate", methods=["POST"])
+def api_planner_simulate():
+    """
+    Body: {"completed": [...], "bundles": [["CMPT 214", "CMPT 270"], ...]}
+    Scores every bundle against one compiled prereq structure.
+    """
+    payload = request.get_json(silent=True) or {}
+    completed = payload.get("completed", [])
+    bundles = payload.get("bundles", [])
+
+    if not _is_code_list(completed):
+        return jsonify({"error": "'completed' must be a list of course code strings"}), 400
+    if not isinstance(bundles, list) or not bundles or not all(_is_code_list(b) for b in bundles):
+        return jsonify({"error": "'bundles' must be a non-empty list of course code lists"}), 400
+    if len(bundles) > MAX_SIMULATION_BUNDLES:
+        return jsonify({"error": f"At most {MAX_SIMULATION_BUNDLES} bundles per request"}), 400
+
+    completed_set = {normalize_code(c) for c in completed}
+
+    degree = json.loads(DEFAULT_DEGREE_FILE.read_text(encoding="utf-8"))
+    required = [normalize_code(c) for c in degree.get("required_courses", [])]
+
+    compiled = CompiledPrereqs(build_degree_course_map(required))
+    result = simulate_bundles(compiled, completed_set, bundles)
+
+    return jsonify({"completed_count": len(completed_set), "bundle_count": len(bundles), **result})
@@ -0,0 +1,136 @@
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+import io
+
+from app.auth import is_admin
+from app.db import db
+from app.models import Plan
+from app.services import (
+    plan_row,
+    get_user_plan,
+    plan_export_dict,
+    iter_plans_ndjson,
+    import_plans_ndjson,
+    record_plan_progress,
+    USER_ID_MAX_LEN,
+)
+
+# "plans" route group: per-user plan storage + bulk NDJSON
+bp = Blueprint("plans", __name__)
+
+
+# ---------------------------
+# API: Plan Save/Load
+# ---------------------------
+
+def _request_user_id() -> str:
+    """
+    Which user a plan request is for: the X-User-Id header only, which the
+    authenticating reverse proxy must set (and strip from client requests).
+    Without it, "" (the shared bucket the planner page uses).
+    """
+    return request.headers.get("X-User-Id", "").strip()
+
+
+@bp.before_request
+def _check_user_id():
+    if len(_request_user_id()) > USER_ID_MAX_LEN:
+        return jsonify({"error": f"X-User-Id is longer than {USER_ID_MAX_LEN} characters"}), 400
+
+
+@bp.route("/api/plan/save", methods=["POST"])
+def api_plan_save():
+    payload = request.get_json(silent=True) or {}
+    user_id = _request_user_id()
+
+    try:
+        values = plan_row(payload, user_id)
+        plan_id = int(payload["id"]) if payload.get("id") else None
+    except TypeError:
+        return jsonify({"error": "'id' must be a plan id"}), 400
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    if plan_id:
+        plan = get_user_plan(user_id, plan_id)
+        if not plan:
+            return jsonify({"error": "Plan not found"}), 404
+    else:
+        plan = Plan()
+
+    for k, v in values.items():
+        setattr(plan, k, v)
+
+    db.session.add(plan)
+    db.session.flush()
+    record_plan_progress([plan])
+    db.session.commit()
+
+    return jsonify({"ok": True, "plan": plan.to_dict()})
+
+
+@bp.route("/api/plan/load", methods=["GET"])
+def api_plan_load():
+    plan = get_user_plan(_request_user_id())
+    if not plan:
+        return jsonify({"plan": None})
+    return jsonify({"plan": plan.to_dict()})
+
+
+@bp.route("/api/plan/export", methods=["GET"])
+def api_plan_export():
+    plan = get_user_plan(_request_user_id())
+    if not plan:
+        return jsonify({"error": "No plan found"}), 404
+
+    return jsonify(plan_export_dict(plan))
+
+
+@bp.route("/api/plan/import", methods=["POST"])
+def api_plan_import():
+    payload = request.get_json(silent=True) or {}
+
+    try:
+        plan = Plan(**plan_row(payload, _request_user_id(), default_name="Imported Plan"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    db.session.add(plan)
+    db.session.flush()
+    record_plan_progress([plan])
+    db.session.commit()
+
+    return jsonify({"ok": True, "plan": plan.to_dict()})
+
+
+# ---------------------------
+# API: Bulk plans (NDJSON, one plan per line)
+# ---------------------------
+
+@bp.route("/api/plans/export", methods=["GET"])
+def api_plans_export():
+    # ?all=1 (admin only) -> every user's plans, e.g. an advising-office migration
+    if request.args.get("all") in ("1", "true"):
+        if not is_admin():
+            return jsonify({"error": "Exporting all users' plans requires an admin token"}), 403
+        user_id = None
+    else:
+        user_id = _request_user_id()
+
+    return Response(
+        stream_with_context(iter_plans_ndjson(user_id)),
+        mimetype="application/x-ndjson",
+    )
+
+
+@bp.route("/api/plans/import", methods=["POST"])
+def api_plans_import():
+    # ?keep_user_ids=1 (admin only) -> each line's "user_id" decides the owner
+    keep_line_users = request.args.get("keep_user_ids") in ("1", "true")
+    if keep_line_users and not is_admin():
+        return jsonify({"error": "Importing plans for other users requires an admin token"}), 403
+
+    # read the body line by line instead of loading it whole; the raw stream
+    # has no buffered readline (one byte per read), so wrap it
+    lines = io.BufferedReader(request.stream)
+    result = import_plans_ndjson(lines, _request_user_id(), keep_line_users=keep_line_users)
+    return jsonify({"ok": True, **result})
@@ -8,20 +8,25 @@ from __future__ import annotations
 
 import json
 import re
+import threading
 import time
 from pathlib import Path
 from typing import Any, Dict, Optional
 
-import requests
-from bs4 import BeautifulSoup
+from app.scraper_backends import FetchError, ReplayBackend, backend_from_env
+
+# bs4 (and requests, in scraper_backends) are imported inside the functions that use them,
+# so importing this module (e.g. via routes) stays cheap.
 
 CATALOGUE_BASE = "https://catalogue.usask.ca"
 
 CACHE_DIR = Path(__file__).resolve().parent / ".cache"
-CACHE_DIR.mkdir(exist_ok=True)
 CACHE_TTL_SECONDS = 60 * 60 * 24 * 7  # 7 days
 TIMEOUT = 15
 
+_backend = None
+_backend_lock = threading.Lock()
+
 
 # Cache utilities
 def _cache_path(course_code: str) -> Path:
@@ -42,6 +47,7 @@ def _read_cache(course_code: str) -> Optional[Dict[str, Any]]:
 def _write_cache(course_code: str, payload: Dict[str, Any]) -> None:
     payload = dict(payload)
     payload["saved_at"] = time.time()
+    CACHE_DIR.mkdir(exist_ok=True)
     _cache_path(course_code).write_text(json.dumps(payload, indent=2))
 
 
@@ -65,6 +71,8 @@ def course_url(course_code: str) -> str:
 
 def extract_description(html: str) -> str:
     """Extract course description from USask catalogue HTML."""
+    from bs4 import BeautifulSoup
+
     soup = BeautifulSoup(html, "html.parser")
 
     # Find the Description section by ID
@@ -88,53 +96,85 @@ def extract_description(html: str) -> str:
 
 # Main scraping function
 
-def scrape_course_page(course_code: str) -> Dict[str, Any]:
-    """Scrape a single course page from USask catalogue."""
-    url = course_url(course_code)
+def get_backend():
+    """The page-fetching backend (see scraper_backends.py), built from env on first use."""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = backend_from_env(TIMEOUT)
+        return _backend
 
-    try:
-        r = requests.get(
-            url,
-            timeout=TIMEOUT,
-            headers={
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-            },
-        )
-
-        if r.status_code == 404:
-            return {
-                "course_code": normalize_course_code(course_code),
-                "source_url": url,
-                "raw_text": "",
-                "not_found": True,
-            }
-
-        r.raise_for_status()
-
-    except requests.RequestException as e:
-        return {
-            "course_code": normalize_course_code(course_code),
-            "source_url": url,
-            "raw_text": "",
-            "not_found": True,
-            "error": str(e),
-        }
-
-    desc = extract_description(r.text)
-
-    return {
+
+def set_backend(backend) -> None:
+    """Swap the backend (e.g. a ReplayBackend for tests / load runs)."""
+    global _backend
+    with _backend_lock:
+        _backend = backend
+
+
+def _use_disk_cache() -> bool:
+    """
+    Replay runs skip app/.cache both ways: they must serve only the archive, and
+    archive pages must not stand in for live ones later.
+    """
+    return not isinstance(get_backend(), ReplayBackend)
+
+
+def fetch_course_page(course_code: str) -> Dict[str, Any]:
+    """
+    Network half of scraping: download the page, no parsing.
+    Returns {course_code, source_url, status, html, error}.
+    """
+    url = course_url(course_code)
+    fetched: Dict[str, Any] = {
         "course_code": normalize_course_code(course_code),
         "source_url": url,
-        "raw_text": desc[:6000],
-        "not_found": not bool(desc),
+        "status": None,
+        "html": "",
+        "error": None,
+    }
+
+    try:
+        fetched["status"], fetched["html"] = get_backend().fetch(url)
+    except FetchError as e:
+        fetched["error"] = str(e)
+
+    return fetched
+
+
+def parse_course_page(fetched: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    CPU half of scraping: turn a fetch_course_page() result into the cache payload.
+    """
+    payload: Dict[str, Any] = {
+        "course_code": fetched["course_code"],
+        "source_url": fetched["source_url"],
+        "raw_text": "",
+        "not_found": True,
     }
+    if fetched.get("error"):
+        payload["error"] = fetched["error"]
+        return payload
+    if not fetched.get("html"):
+        return payload
+
+    desc = extract_description(fetched["html"])
+    payload["raw_text"] = desc[:6000]
+    payload["not_found"] = not bool(desc)
+    return payload
+
+
+def scrape_course_page(course_code: str) -> Dict[str, Any]:
+    """Scrape a single course page from USask catalogue."""
+    return parse_course_page(fetch_course_page(course_code))
 
 
 def get_course_raw_info(course_code: str) -> Dict[str, Any]:
     """Get course info with caching."""
     course_code = normalize_course_code(course_code)
+    use_cache = _use_disk_cache()
 
-    cached = _read_cache(course_code)
+    cached = _read_cache(course_code) if use_cache else None
     if cached:
         cached["from_cache"] = True
         # Ensure key exists for callers
@@ -143,5 +183,7 @@ def get_course_raw_info(course_code: str) -> Dict[str, Any]:
 
     payload = scrape_course_page(course_code)
     payload["from_cache"] = False
-    _write_cache(course_code, payload)
+    if use_cache and not payload.get("error"):
+        # a failed fetch is not a "not found" page; retry it next time
+        _write_cache(course_code, payload)
     return payload
\ No newline at end of file
@@ -0,0 +1,129 @@
+"""
+scraper_backends.py
+Where catalogue pages come from. scraper.fetch_course_page() asks the active backend.
+
+  live    plain HTTP to the catalogue (default)
+  record  live, and every page is also saved into a zip archive
+  replay  serve pages from that archive only, never touching the network
+
+Pick one with env vars (read on first fetch):
+  SCRAPER_BACKEND=live|record|replay
+  SCRAPER_ARCHIVE=path/to/catalogue.zip   (record / replay; default app/fixtures/catalogue.zip)
+
+Example: record once, then crawl offline as often as you like
+  SCRAPER_BACKEND=record python -m app.crawler
+  SCRAPER_BACKEND=replay python -m app.crawler
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+import zipfile
+from pathlib import Path
+from typing import Tuple
+
+DEFAULT_ARCHIVE = Path(__file__).resolve().parent / "fixtures" / "catalogue.zip"
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+
+
+class FetchError(Exception):
+    """The page could not be fetched (network error, bad status, not recorded)."""
+
+
+def _entry_name(url: str) -> str:
+    slug = re.sub(r"^https?://", "", url).strip("/")
+    return re.sub(r"[^a-zA-Z0-9_.-]+", "_", slug) + ".json"
+
+
+class LiveBackend:
+    def __init__(self, timeout: float = 15):
+        self.timeout = timeout
+
+    def fetch(self, url: str) -> Tuple[int, str]:
+        """Returns (status, html). 404 is a normal result; other failures raise FetchError."""
+        import requests
+
+        try:
+            r = requests.get(url, timeout=self.timeout, headers={"User-Agent": USER_AGENT})
+            if r.status_code == 404:
+                return 404, ""
+            r.raise_for_status()
+        except requests.RequestException as e:
+            raise FetchError(str(e)) from e
+
+        return r.status_code, r.text
+
+
+class RecordingBackend:
+    """
+    Live fetches, saved into a deflate-compressed zip (one JSON entry per URL).
+    The zip is reopened per write so it's always valid on disk, even if the crawl is killed.
+    Already-recorded URLs are kept as-is; delete the archive to re-record.
+    """
+
+    def __init__(self, archive: Path, live: LiveBackend | None = None):
+        self.archive = Path(archive)
+        self.live = live or LiveBackend()
+        self._lock = threading.Lock()
+        self._recorded: set[str] | None = None
+
+    def fetch(self, url: str) -> Tuple[int, str]:
+        status, html = self.live.fetch(url)
+        self._save(url, status, html)
+        return status, html
+
+    def _save(self, url: str, status: int, html: str) -> None:
+        name = _entry_name(url)
+        with self._lock:
+            if self._recorded is None:
+                self.archive.parent.mkdir(parents=True, exist_ok=True)
+                self._recorded = set()
+                if self.archive.exists():
+                    with zipfile.ZipFile(self.archive) as zf:
+                        self._recorded = set(zf.namelist())
+            if name in self._recorded:
+                return
+
+            with zipfile.ZipFile(self.archive, "a", compression=zipfile.ZIP_DEFLATED) as zf:
+                zf.writestr(name, json.dumps({"url": url, "status": status, "html": html}))
+            self._recorded.add(name)
+
+
+class ReplayBackend:
+    """Serves recorded pages; anything not in the archive is a FetchError. No network."""
+
+    def __init__(self, archive: Path):
+        self.archive = Path(archive)
+        if not self.archive.exists():
+            raise FileNotFoundError(f"Replay archive not found: {self.archive}")
+        self._zip = zipfile.ZipFile(self.archive)
+        self._names = set(self._zip.namelist())
+        self._lock = threading.Lock()
+
+    def fetch(self, url: str) -> Tuple[int, str]:
+        name = _entry_name(url)
+        if name not in self._names:
+            raise FetchError(f"Not in replay archive: {url}")
+        with self._lock:
+            entry = json.loads(self._zip.read(name))
+        return entry["status"], entry["html"]
+
+
+BACKENDS = ("live", "record", "replay")
+
+
+def backend_from_env(timeout: float = 15):
+    kind = os.getenv("SCRAPER_BACKEND", "live").strip().lower()
+    archive = Path(os.getenv("SCRAPER_ARCHIVE") or DEFAULT_ARCHIVE)
+
+    if kind == "live":
+        return LiveBackend(timeout)
+    if kind == "record":
+        return RecordingBackend(archive, LiveBackend(timeout))
+    if kind == "replay":
+        return ReplayBackend(archive)
+    raise ValueError(f"Unknown SCRAPER_BACKEND '{kind}' (expected one of {', '.join(BACKENDS)})")
@@ -1,9 +1,13 @@
+import hashlib
 import json
-from typing import Dict, List, Set, Any
+from typing import Dict, Iterable, Iterator, List, Set, Any
 from datetime import datetime
 
+from sqlalchemy import insert
+
+from app.analytics import DEFAULT_DEGREE, degree_exists, update_plan_progress
 from app.db import db
-from app.models import CourseCache
+from app.models import CourseCache, CourseChange, Plan
 from app.scraper import get_course_raw_info
 from app.planner import normalize_code, parse_prereqs, prereqs_satisfied
 
@@ -13,19 +17,71 @@ def _coursecache_get(code: str) -> CourseCache | None:
     return CourseCache.query.filter_by(code=code).first()
 
 
-def _coursecache_upsert(code: str, source_url: str, raw_text: str, prereq_groups: List[List[str]]) -> CourseCache:
+def content_hash(raw_text: str, prereqs_json: str) -> str:
+    return hashlib.sha256(json.dumps([raw_text or "", prereqs_json or "[]"]).encode("utf-8")).hexdigest()
+
+
+def _coursecache_upsert(code: str, source_url: str, raw_text: str, prereq_groups: List[List[str]]) -> CourseChange | None:
+    """
+    Writes the course only if its content hash changed, and records a CourseChange
+    event when it did. Returns that event (None = unchanged). Caller commits.
+    """
     code = normalize_code(code)
+    raw_text = raw_text or ""
+    prereqs_json = json.dumps(prereq_groups or [])
+    new_hash = content_hash(raw_text, prereqs_json)
+
     row = _coursecache_get(code)
-    if not row:
+    if row:
+        # rows cached before hashing existed have no stored hash yet
+        old_hash = row.content_hash or content_hash(row.raw_text, row.prereqs_json)
+        if old_hash == new_hash:
+            if not row.content_hash or (source_url and row.source_url != source_url):
+                row.content_hash = new_hash
+                row.source_url = source_url or row.source_url
+            return None
+        change = CourseChange(
+            code=code,
+            old_hash=old_hash,
+            new_hash=new_hash,
+            old_prereqs_json=row.prereqs_json or "[]",
+            new_prereqs_json=prereqs_json,
+            text_changed=(row.raw_text or "") != raw_text,
+            prereqs_changed=json.loads(row.prereqs_json or "[]") != (prereq_groups or []),
+        )
+    else:
         row = CourseCache(code=code)
+        change = CourseChange(
+            code=code,
+            old_hash="",
+            new_hash=new_hash,
+            old_prereqs_json=None,
+            new_prereqs_json=prereqs_json,
+            text_changed=bool(raw_text),
+            prereqs_changed=bool(prereq_groups),
+        )
 
     row.source_url = source_url or ""
-    row.raw_text = raw_text or ""
-    row.prereqs_json = json.dumps(prereq_groups or [])
+    row.raw_text = raw_text
+    row.prereqs_json = prereqs_json
+    row.content_hash = new_hash
     row.updated_at = datetime.utcnow()
 
     db.session.add(row)
-    return row
+    db.session.add(change)
+    return change
+
+
+def course_changes(since: int = 0, limit: int = 500, code: str | None = None, prereqs_only: bool = False) -> List[Dict[str, Any]]:
+    """
+    The change feed: events with version > since, oldest first.
+    """
+    q = CourseChange.query.filter(CourseChange.id > since)
+    if code:
+        q = q.filter_by(code=normalize_code(code))
+    if prereqs_only:
+        q = q.filter_by(prereqs_changed=True)
+    return [c.to_dict() for c in q.order_by(CourseChange.id).limit(limit)]
 
 
 def get_or_scrape_course(code: str) -> Dict[str, Any]:
@@ -179,4 +235,142 @@ def planner_status(required_codes: List[str], completed: Set[str]) -> Dict[str,
         "completed_count": len(completed_norm),
         "unlocked": sorted(unlocked),
         "locked": sorted(locked, key=lambda x: x["code"]),
-    }
\ No newline at end of file
+    }
+
+
+# ---------------------------
+# Plans (user-scoped storage + bulk NDJSON)
+# ---------------------------
+
+PLAN_BATCH_SIZE = 1000  # rows per INSERT / rows fetched per export chunk
+PLAN_IMPORT_MAX_ERRORS = 20  # how many bad lines we echo back to the caller
+USER_ID_MAX_LEN = 64  # Plan.user_id column size
+
+
+def plan_row(payload: Dict[str, Any], user_id: str, default_name: str = "My Plan") -> Dict[str, Any]:
+    """
+    Turns a plan payload ({name, completed, notes, degree}) into column values for Plan.
+    """
+    completed = payload.get("completed", []) or []
+    if not isinstance(completed, list) or not all(isinstance(c, str) for c in completed):
+        raise ValueError("'completed' must be a list of course codes")
+    if len(user_id or "") > USER_ID_MAX_LEN:
+        raise ValueError(f"user id is longer than {USER_ID_MAX_LEN} characters")
+
+    degree = str(payload.get("degree") or DEFAULT_DEGREE)
+    if not degree_exists(degree):
+        raise ValueError(f"Unknown degree '{degree}'")
+
+    return {
+        "user_id": user_id or "",
+        "degree": degree,
+        "name": (str(payload.get("name") or default_name).strip() or default_name)[:120],
+        "completed_json": json.dumps([normalize_code(c) for c in completed if c.strip()]),
+        "notes": str(payload.get("notes") or ""),
+    }
+
+
+def record_plan_progress(plans: Iterable[Plan]) -> None:
+    """Refresh the degree analytics for saved (flushed) plans; caller commits."""
+    update_plan_progress([
+        (p.id, p.degree, json.loads(p.completed_json or "[]")) for p in plans
+    ])
+
+
+def get_user_plan(user_id: str, plan_id: int | None = None) -> Plan | None:
+    """
+    A specific plan of this user, or the user's latest plan when plan_id is None.
+    """
+    q = Plan.query.filter_by(user_id=user_id or "")
+    if plan_id is not None:
+        return q.filter_by(id=plan_id).first()
+    return q.order_by(Plan.id.desc()).first()
+
+
+def plan_export_dict(plan: Plan) -> Dict[str, Any]:
+    return {
+        "name": plan.name,
+        "completed": json.loads(plan.completed_json or "[]"),
+        "notes": plan.notes,
+    }
+
+
+def iter_plans_ndjson(user_id: str | None = None) -> Iterator[str]:
+    """
+    Streams plans as NDJSON lines (one plan per line), oldest first.
+    user_id=None exports every user's plans.
+    Rows are fetched PLAN_BATCH_SIZE at a time so memory stays flat.
+    """
+    q = Plan.query
+    if user_id is not None:
+        q = q.filter_by(user_id=user_id)
+
+    for plan in q.order_by(Plan.id).yield_per(PLAN_BATCH_SIZE):
+        line = plan_export_dict(plan)
+        line["id"] = plan.id
+        line["user_id"] = plan.user_id
+        line["degree"] = plan.degree
+        line["created_at"] = plan.created_at.isoformat()
+        yield json.dumps(line) + "\n"
+
+
+def import_plans_ndjson(
+    lines: Iterable[bytes | str],
+    user_id: str = "",
+    keep_line_users: bool = False,
+) -> Dict[str, Any]:
+    """
+    Imports plans from NDJSON lines, committing every PLAN_BATCH_SIZE rows.
+    Every plan goes to user_id. Only with keep_line_users (admin migrations)
+    does a line's own "user_id" decide the owner.
+    Bad lines are skipped and reported (line number + reason).
+    Degree analytics are updated per batch in the same transaction.
+    """
+    imported = 0
+    skipped = 0
+    errors: List[Dict[str, Any]] = []
+    batch: List[Dict[str, Any]] = []
+
+    def flush():
+        nonlocal imported, batch
+        if batch:
+            inserted = db.session.execute(
+                insert(Plan).returning(Plan.id, sort_by_parameter_order=True), batch
+            ).scalars().all()
+            update_plan_progress([
+                (plan_id, row["degree"], json.loads(row["completed_json"]))
+                for plan_id, row in zip(inserted, batch)
+            ])
+            db.session.commit()
+            imported += len(batch)
+            batch = []
+
+    for lineno, line in enumerate(lines, start=1):
+        if isinstance(line, bytes):
+            line = line.decode("utf-8", errors="replace")
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            payload = json.loads(line)
+            if not isinstance(payload, dict):
+                raise ValueError("line is not a JSON object")
+            owner = (payload.get("user_id") if keep_line_users else None) or user_id or ""
+            batch.append(plan_row(payload, str(owner), default_name="Imported Plan"))
+        except ValueError as e:  # json.JSONDecodeError is a ValueError
+            skipped += 1
+            if len(errors) < PLAN_IMPORT_MAX_ERRORS:
+                errors.append({"line": lineno, "error": str(e)})
+            continue
+
+        if len(batch) >= PLAN_BATCH_SIZE:
+            flush()
+
+    flush()
+
+    return {
+        "imported": imported,
+        "skipped": skipped,
+        "errors": errors,
+    }
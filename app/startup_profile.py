@@ -0,0 +1,97 @@
+"""
+startup_profile.py
+Import-time report for app startup (what a fresh gunicorn worker pays before its first request).
+
+Usage:
+  python -m app.startup_profile                 # default (lazy) startup
+  python -m app.startup_profile --preload       # with PLANNER_PRELOAD=1
+  python -m app.startup_profile --top 30 --groups planner,plans
+"""
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+STARTUP_CODE = "import app; app.create_app()"
+
+
+def parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """
+    Parses `python -X importtime` lines:
+      import time: self [us] | cumulative | imported package
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # header line
+        name = parts[2].rstrip()
+        rows.append({
+            "module": name.strip(),
+            "depth": (len(name) - len(name.lstrip())) // 2,
+            "self_us": int(parts[0]),
+            "cumulative_us": int(parts[1]),
+        })
+    return rows
+
+
+def profile_startup(preload: bool = False, groups: str | None = None) -> Dict[str, Any]:
+    """Starts a fresh interpreter that builds the app and measures it."""
+    env = dict(os.environ)
+    env["PLANNER_PRELOAD"] = "1" if preload else "0"
+    if groups is not None:
+        env["PLANNER_ROUTE_GROUPS"] = groups
+
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", STARTUP_CODE],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    wall = time.perf_counter() - started
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "startup failed")
+
+    rows = parse_importtime(proc.stderr)
+    top_level = [r for r in rows if r["depth"] == 0]
+
+    return {
+        "wall_seconds": round(wall, 3),
+        "import_seconds": round(sum(r["cumulative_us"] for r in top_level) / 1e6, 3),
+        "modules_imported": len(rows),
+        # ru_maxrss is KiB on Linux (bytes on macOS); only one child has run so far
+        "max_rss_mb": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024, 1),
+        "imports": rows,
+    }
+
+
+def print_report(report: Dict[str, Any], top: int = 20) -> None:
+    print(f"wall time:        {report['wall_seconds']:.3f}s")
+    print(f"import time:      {report['import_seconds']:.3f}s")
+    print(f"modules imported: {report['modules_imported']}")
+    print(f"max RSS:          {report['max_rss_mb']} MB")
+    print()
+    print(f"top {top} top-level imports by cumulative time:")
+    top_level = [r for r in report["imports"] if r["depth"] == 0]
+    for r in sorted(top_level, key=lambda r: r["cumulative_us"], reverse=True)[:top]:
+        print(f"  {r['cumulative_us'] / 1000:9.1f} ms  {r['module']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument("--preload", action="store_true", help="profile with PLANNER_PRELOAD=1")
+    parser.add_argument("--groups", default=None, help="PLANNER_ROUTE_GROUPS for the run")
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+
+    print_report(profile_startup(preload=args.preload, groups=args.groups), top=args.top)